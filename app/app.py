@@ -1,4 +1,7 @@
+import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 from dotenv import load_dotenv
@@ -23,9 +26,79 @@ if not OPENAI_KEY:
 if not ULTRADNS_USERNAME or not ULTRADNS_PASSWORD:
     raise ValueError("Missing ULTRADNS_USERNAME or ULTRADNS_PASSWORD environment variables.")
 
-# Step 4: Initialize Slack app and InferenceClient
+# Step 4: Initialize Slack app, InferenceClient, and the background executor
 app = App(token=SLACK_BOT_TOKEN)
 inference_client = InferenceClient()
+# Matches Slack user mention tokens such as <@U012AB3CD> or <@U012AB3CD|name>.
+MENTION_RE = re.compile(r"<@[UW][A-Z0-9]+(?:\|[^>]*)?>")
+# Slash command work runs here so Bolt's workers are freed as soon as a command is acknowledged.
+executor = ThreadPoolExecutor(max_workers=16)
+
+def get_dns_client():
+    """
+    Return the shared, authenticated UltraDNSClient.
+
+    Returns:
+        UltraDNSClient: The client instance reused across Slack commands.
+    """
+    return UltraDNSClient.get_instance(ULTRADNS_USERNAME, ULTRADNS_PASSWORD)
+
+def process_zones(zones, process_one, error_prefix):
+    """
+    Run a per-zone task for several zones concurrently and combine the results.
+
+    Args:
+        zones (list): The zone names to process.
+        process_one (function): Called as process_one(zone_name); returns the zone's Slack text.
+        error_prefix (str): Prefix of the line reported when a zone fails.
+
+    Returns:
+        str: One Slack message with a section per zone, in input order.
+    """
+    def run(zone_name):
+        try:
+            return process_one(zone_name)
+        except Exception as e:
+            return f"{error_prefix} {zone_name}: {e}"
+
+    # A separate pool from the module-level executor, which is running this call
+    with ThreadPoolExecutor(max_workers=min(8, len(zones))) as zone_pool:
+        results = list(zone_pool.map(run, zones))
+
+    return "\n\n".join(f"*{zone_name}*\n{result}" for zone_name, result in zip(zones, results))
+
+def run_in_background(respond, work, *args):
+    """
+    Run a slash command's work on the background executor.
+
+    `respond` posts to the command's response_url, so it keeps working after
+    the handler has returned.
+
+    Args:
+        respond: Function to send a response to Slack.
+        work (function): Called as work(respond, *args).
+        *args: Additional arguments for `work`.
+    """
+    def run():
+        try:
+            work(respond, *args)
+        except Exception as e:
+            respond(f"Unexpected error: {e}")
+
+    executor.submit(run)
+
+def parse_zones(text):
+    """
+    Parse zone names from slash command text.
+
+    Args:
+        text (str): The command text, with zones separated by spaces and/or commas.
+
+    Returns:
+        list: The zone names, without empty entries or duplicates, in the requested order.
+    """
+    zones = [zone.strip(",") for zone in text.split()]
+    return list(dict.fromkeys(zone for zone in zones if zone))
 
 # Step 5: Define the bot commands
 # Slash command: /udns-system-status
@@ -42,13 +115,22 @@ def udns_system_status(ack, respond):
     - Calls InferenceClient to analyze the system status.
     """
     ack()
+    run_in_background(respond, check_system_status)
+
+def check_system_status(respond):
+    """
+    Fetch and analyze the UltraDNS system status.
+
+    Args:
+        respond: Function to send a response to Slack.
+    """
     try:
-        # Fetch system status using UltraDNSClient
-        client = UltraDNSClient(ULTRADNS_USERNAME, ULTRADNS_PASSWORD)
+        # Fetch system status using the shared UltraDNSClient
+        client = get_dns_client()
         system_status = client.fetch_system_status()
 
         # Use InferenceClient to process the system status
-        inference_client.status_check(system_status, respond)
+        respond(inference_client.status_check(system_status))
 
     except Exception as e:
         respond(f"Error fetching or analyzing system status: {e}")
@@ -65,27 +147,51 @@ def analyze_zone_file(ack, respond, command):
         command: The incoming Slack command data.
 
     - Parses the zone names from the command input.
-    - Uses UltraDNSClient to fetch zone data.
-    - Calls InferenceClient to analyze the zone file.
+    - Uses UltraDNSClient to export all zones in a single task.
+    - Calls InferenceClient to analyze each zone file.
     """
     ack()
-    zones = [zone.strip(",") for zone in command["text"].split()]
+    zones = parse_zones(command["text"])
+    if not zones:
+        respond("Please provide at least one zone name.")
+        return
+    run_in_background(respond, analyze_zones, zones)
+
+def analyze_zones(respond, zones):
+    """
+    Export and analyze a list of zones.
+
+    Args:
+        respond: Function to send a response to Slack.
+        zones (list): The zone names to analyze.
+    """
     try:
-        client = UltraDNSClient(ULTRADNS_USERNAME, ULTRADNS_PASSWORD)
+        client = get_dns_client()
     except Exception as e:
         respond(f"Authentication failed: {e}")
         return
 
-    results = []
-    for zone_name in zones:
-        try:
+    # Export all zones in one task. If UltraDNS rejects a batch of several zones
+    # (e.g., one zone does not exist), fall back to per-zone exports so each zone
+    # reports its own result. Any other failure would only repeat per zone.
+    try:
+        zone_files = client.fetch_zone_data_bulk(zones)
+    except ValueError as e:
+        if len(zones) == 1:
+            respond(f"*{zones[0]}*\nError analyzing zone {zones[0]}: {e}")
+            return
+        zone_files = {}
+    except Exception as e:
+        respond(f"Error exporting zones: {e}")
+        return
+
+    def analyze_one(zone_name):
+        zone_data = zone_files.get(zone_name)
+        if zone_data is None:
             zone_data = client.fetch_zone_data(zone_name)
-            inference_client.zone_inference(zone_data, respond)
-            results.append(f"Zone {zone_name} analyzed successfully.")
-        except Exception as e:
-            results.append(f"Error analyzing zone {zone_name}: {e}")
+        return inference_client.zone_inference(zone_data)
 
-    respond("\n".join(results))
+    respond(process_zones(zones, analyze_one, "Error analyzing zone"))
 
 # Slash command: /zone-health-check
 @app.command("/zone-health-check")
@@ -99,27 +205,40 @@ def zone_health_check(ack, respond, command):
         command: The incoming Slack command data.
 
     - Parses the zone names from the command input.
-    - Uses UltraDNSClient to fetch health check data.
-    - Calls InferenceClient to analyze the health check JSON.
+    - Uses UltraDNSClient to start and poll all health checks together.
+    - Calls InferenceClient to analyze each health check JSON.
     """
     ack()
-    zones = [zone.strip(",") for zone in command["text"].split()]
+    zones = parse_zones(command["text"])
+    if not zones:
+        respond("Please provide at least one zone name.")
+        return
+    run_in_background(respond, check_zones, zones)
+
+def check_zones(respond, zones):
+    """
+    Run and analyze health checks for a list of zones.
+
+    Args:
+        respond: Function to send a response to Slack.
+        zones (list): The zone names to check.
+    """
     try:
-        client = UltraDNSClient(ULTRADNS_USERNAME, ULTRADNS_PASSWORD)
+        client = get_dns_client()
     except Exception as e:
         respond(f"Authentication failed: {e}")
         return
 
-    results = []
-    for zone_name in zones:
-        try:
-            health_check = client.fetch_health_check(zone_name)
-            inference_client.zone_healthcheck(health_check, respond)
-            results.append(f"Zone {zone_name} health check completed.")
-        except Exception as e:
-            results.append(f"Error analyzing zone {zone_name}: {e}")
+    # Start every health check up front and poll them together on this thread.
+    health_checks = client.fetch_health_checks(zones)
+
+    def check_one(zone_name):
+        health_check = health_checks[zone_name]
+        if isinstance(health_check, Exception):
+            raise health_check
+        return inference_client.zone_healthcheck(health_check)
 
-    respond("\n".join(results))
+    respond(process_zones(zones, check_one, "Error analyzing zone"))
 
 # Event listener for bot mentions
 @app.event("app_mention")
@@ -131,15 +250,17 @@ def handle_mention(event, say):
         event: The incoming Slack event data.
         say: Function to send a response to Slack.
 
-    - Extracts and processes the text after the @mention.
+    - Strips all @mentions from the text and processes the rest.
     - Calls InferenceClient to handle DNS-related questions.
     """
-    text = event.get("text", "").replace(f"<@{event['user']}>", "").strip()
+    text = event.get("text", "").strip()
+    if text:
+        text = MENTION_RE.sub("", text).strip()
     if not text:
         say("Please provide a question related to DNS.")
         return
 
-    inference_client.dns_helper(text, say)
+    inference_client.dns_helper(text, say, user=event.get("user"))
 
 # Generic message handler
 @app.event("message")
@@ -147,11 +268,15 @@ def handle_message_events(body, logger):
     """
     Log and handle unprocessed Slack messages.
 
+    Message bodies are only logged at DEBUG level, so the common case skips
+    formatting them entirely.
+
     Args:
         body: The incoming Slack message data.
         logger: Logger instance to log the message data.
     """
-    logger.info(body)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(body)
 
 # Step 6: Start the Slack app using the SocketModeHandler
 if __name__ == "__main__":
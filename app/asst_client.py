@@ -1,7 +1,51 @@
+import functools
 import json
 import os
+import threading
+import httpx
+from cachetools import TTLCache
 from openai import OpenAI
 
+# Marks the end of a static preamble message; the next message holds the payload.
+PAYLOAD_BREAK = "\n---\nPAYLOAD:\n"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config(config_file):
+    """
+    Read and parse the assistant configuration file once.
+
+    The configuration is written by initialize.py before the bot starts and does
+    not change at runtime, so the parsed result is reused for every lookup.
+
+    Args:
+        config_file (str): Path to the configuration file.
+
+    Returns:
+        dict: The parsed configuration.
+    """
+    with open(config_file, "r") as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_openai_client(api_key):
+    """
+    Return a shared OpenAI client for an API key.
+
+    The client is thread-safe and pools its HTTP connections, so reusing it keeps
+    connections alive across assistant runs. The pool is sized for concurrent
+    per-zone analyses.
+
+    Args:
+        api_key (str): API key for OpenAI.
+
+    Returns:
+        OpenAI: The shared client instance.
+    """
+    http_client = httpx.Client(limits=httpx.Limits(max_connections=50, max_keepalive_connections=20))
+    return OpenAI(api_key=api_key, http_client=http_client)
+
 
 class AssistantClient:
     """
@@ -9,7 +53,7 @@ class AssistantClient:
 
     This client abstracts the process of interacting with OpenAI assistants, including:
     - Loading assistant IDs from a configuration file.
-    - Creating threads for conversation context.
+    - Creating threads for conversation context, and reusing them per conversation key.
     - Adding messages to threads.
     - Running the assistant to process input and return responses.
 
@@ -18,7 +62,7 @@ class AssistantClient:
     Attributes:
         config_file (str): Path to the configuration file containing assistant IDs.
         api_key (str): API key for OpenAI.
-        client (OpenAI): Instance of the OpenAI client.
+        client (OpenAI): Shared instance of the OpenAI client.
         assistant_id (str): ID of the specified assistant.
     """
 
@@ -35,8 +79,10 @@ class AssistantClient:
         self.api_key = api_key or os.getenv("OPENAI_KEY")
         if not self.api_key:
             raise EnvironmentError("OPENAI_KEY environment variable is not set and no API key was provided.")
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = _get_openai_client(self.api_key)
         self.assistant_id = self._load_assistant_id(assistant_name)
+        self._threads = TTLCache(maxsize=1024, ttl=1800)  # thread_key -> conversation
+        self._threads_lock = threading.Lock()
 
     def _load_assistant_id(self, assistant_name):
         """
@@ -54,8 +100,7 @@ class AssistantClient:
             RuntimeError: For any other errors while loading the configuration.
         """
         try:
-            with open(self.config_file, "r") as f:
-                config = json.load(f)
+            config = _load_config(self.config_file)
             key = f"{assistant_name}_id"
             assistant_id = config.get(key)
             if not assistant_id or not assistant_id.startswith("asst_"):
@@ -84,13 +129,68 @@ class AssistantClient:
         except Exception as e:
             raise RuntimeError(f"Failed to create a thread: {e}")
 
-    def _add_message_to_thread(self, thread_id, content):
+    def _start_thread(self, preamble=None):
+        """
+        Create a new thread, adding the preamble as its first message.
+
+        Args:
+            preamble (str, optional): Static instructions to send ahead of the content. Defaults to None.
+
+        Returns:
+            str: The thread ID.
+
+        Raises:
+            RuntimeError: If creating the thread or adding the preamble fails.
+        """
+        thread_id = self._create_thread()
+        if preamble:
+            self._add_message_to_thread(thread_id, f"{preamble}{PAYLOAD_BREAK}")
+        return thread_id
+
+    def _conversation(self, thread_key):
+        """
+        Return the conversation state for a key, creating it on a miss.
+
+        Each conversation holds its thread ID, which stays None until the thread
+        and its preamble have been created, and a lock that serializes turns so
+        a message is never added while a run on the thread is still active.
+        Conversations are kept for 30 minutes after they were created.
+
+        Args:
+            thread_key (str): The conversation key (e.g., a Slack user ID).
+
+        Returns:
+            dict: The conversation's "lock" and "thread_id".
+        """
+        with self._threads_lock:
+            conversation = self._threads.get(thread_key)
+            if conversation is None:
+                conversation = {"lock": threading.Lock(), "thread_id": None}
+                self._threads[thread_key] = conversation
+            return conversation
+
+    def has_thread(self, thread_key):
+        """
+        Check whether a conversation key has a live thread.
+
+        Args:
+            thread_key (str): The conversation key (e.g., a Slack user ID).
+
+        Returns:
+            bool: True if a thread has been started for the key.
+        """
+        with self._threads_lock:
+            conversation = self._threads.get(thread_key)
+            return conversation is not None and conversation["thread_id"] is not None
+
+    def _add_message_to_thread(self, thread_id, content, role="user"):
         """
         Add a message to the thread.
 
         Args:
             thread_id (str): The thread ID.
             content (str): The content to add to the thread.
+            role (str, optional): The message author, "user" or "assistant". Defaults to "user".
 
         Raises:
             RuntimeError: If adding the message fails.
@@ -98,37 +198,155 @@ class AssistantClient:
         try:
             self.client.beta.threads.messages.create(
                 thread_id=thread_id,
-                role="user",
+                role=role,
                 content=content,
             )
         except Exception as e:
             raise RuntimeError(f"Failed to add a message to the thread: {e}")
 
-    def run_assistant(self, content):
+    def complete(self, system, content, model="gpt-4o-mini", max_tokens=400):
         """
-        Run the assistant by creating a thread and adding a message.
+        Answer a prompt with a single chat completion, without using the assistant.
+
+        Args:
+            system (str): The system prompt.
+            content (str): The user message.
+            model (str, optional): The model to use. Defaults to "gpt-4o-mini".
+            max_tokens (int, optional): Maximum tokens to generate. Defaults to 400.
+
+        Returns:
+            str: The completion text.
+
+        Raises:
+            RuntimeError: If the completion request fails.
+        """
+        try:
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": content},
+                ],
+                max_tokens=max_tokens,
+            )
+            return response.choices[0].message.content or ""
+        except Exception as e:
+            raise RuntimeError(f"Error during completion: {e}")
+
+    def run_assistant(self, content, preamble=None, thread_key=None):
+        """
+        Run the assistant by adding a message to a thread.
+
+        When a preamble is given, it is added as its own message ahead of the
+        content so that the static instructions form a stable prompt prefix.
+        With a thread key, the conversation's existing thread is reused and the
+        preamble is only sent when the thread is first created.
+        The run is streamed, so text is available as soon as it is generated.
 
         Args:
             content (str): The content to analyze or process.
+            preamble (str, optional): Static instructions to send before the content. Defaults to None.
+            thread_key (str, optional): Key of the conversation to continue. Defaults to None,
+                which runs on a new one-off thread.
 
         Returns:
-            list: A list of messages from the assistant.
+            generator: Chunks of the assistant's response text, in order.
 
         Raises:
-            RuntimeError: If the assistant run fails.
+            RuntimeError: If the assistant run fails. Errors during the run, and any
+            error on a conversation's thread, are raised while the returned generator
+            is being consumed.
         """
-        thread_id = self._create_thread()
-        self._add_message_to_thread(thread_id, content)
+        if thread_key is None:
+            thread_id = self._start_thread(preamble)
+            self._add_message_to_thread(thread_id, content)
+            return self._stream_run(thread_id)
+        return self._run_conversation(thread_key, content, preamble)
+
+    def _run_conversation(self, thread_key, content, preamble):
+        """
+        Run one turn of a conversation on its thread, holding the conversation's lock.
+
+        The lock is held from adding the message until the run's stream has been
+        read to the end, since a thread rejects new messages while a run is active.
+        The thread is only kept for later turns once its preamble has been added,
+        and is dropped if the turn fails, since a run interrupted by an error may
+        still be active and would make the thread reject every later message.
+
+        Args:
+            thread_key (str): The conversation key (e.g., a Slack user ID).
+            content (str): The content to analyze or process.
+            preamble (str): Static instructions to send when the thread is created, or None.
+
+        Yields:
+            str: Chunks of the assistant's response text.
 
+        Raises:
+            RuntimeError: If creating the thread, adding a message, or the run fails.
+        """
+        conversation = self._conversation(thread_key)
+        with conversation["lock"]:
+            thread_id = conversation["thread_id"]
+            if thread_id is None:
+                thread_id = self._start_thread(preamble)
+                conversation["thread_id"] = thread_id
+            try:
+                self._add_message_to_thread(thread_id, content)
+                yield from self._stream_run(thread_id)
+            except BaseException:
+                conversation["thread_id"] = None
+                raise
+
+    def record_exchange(self, thread_key, content, answer, preamble=None):
+        """
+        Add a question and an answer produced elsewhere to a conversation's thread.
+
+        This lets a later turn run by the assistant see an exchange that was
+        answered without it. The thread is created, with its preamble, if the
+        conversation has none yet, and is only kept once both messages were added.
+
+        Args:
+            thread_key (str): The conversation key (e.g., a Slack user ID).
+            content (str): The user's message.
+            answer (str): The answer that was sent to the user.
+            preamble (str, optional): Static instructions to send when the thread is created. Defaults to None.
+
+        Raises:
+            RuntimeError: If creating the thread or adding a message fails.
+        """
+        conversation = self._conversation(thread_key)
+        with conversation["lock"]:
+            thread_id = conversation["thread_id"]
+            if thread_id is None:
+                thread_id = self._start_thread(preamble)
+            self._add_message_to_thread(thread_id, content)
+            self._add_message_to_thread(thread_id, answer, role="assistant")
+            conversation["thread_id"] = thread_id
+
+    def _stream_run(self, thread_id):
+        """
+        Stream an assistant run on a thread and yield its text deltas.
+
+        Args:
+            thread_id (str): The thread ID.
+
+        Yields:
+            str: Chunks of the assistant's response text.
+
+        Raises:
+            RuntimeError: If the run fails or ends without completing.
+        """
         try:
-            run = self.client.beta.threads.runs.create_and_poll(
+            with self.client.beta.threads.runs.stream(
                 thread_id=thread_id,
                 assistant_id=self.assistant_id,
-                instructions="Address the user as user."
-            )
-            if run.status == "completed":
-                return self.client.beta.threads.messages.list(thread_id=thread_id)
-            else:
-                raise RuntimeError(f"Run not completed. Status: {run.status}")
+            ) as stream:
+                for event in stream:
+                    if event.event == "thread.message.delta":
+                        for part in event.data.delta.content or []:
+                            if part.type == "text" and part.text and part.text.value:
+                                yield part.text.value
+                    elif event.event in ("thread.run.failed", "thread.run.cancelled", "thread.run.expired"):
+                        raise RuntimeError(f"Run not completed. Status: {event.data.status}")
         except Exception as e:
-            raise RuntimeError(f"Error during assistant run: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Error during assistant run: {e}")
@@ -1,6 +1,202 @@
+import functools
+import io
 import json
+import random
+import threading
 import time
-from ultra_rest_client.connection import RestApiConnection
+import zipfile
+import httpx
+from ultra_rest_client.connection import AuthError, RestApiConnection
+
+
+def _reauth_on_auth_error(method):
+    """
+    Retry an UltraDNS API call once after re-authenticating if its token was rejected.
+
+    RestApiConnection refreshes an expired access token on its own; this covers the
+    case where the refresh token has also expired and the refresh raises AuthError.
+
+    Args:
+        method (function): The UltraDNSClient method to wrap.
+
+    Returns:
+        function: The wrapped method.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except AuthError:
+            self._authenticate()
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class Http2RestApiConnection(RestApiConnection):
+    """
+    A RestApiConnection that sends requests over a shared HTTP/2 connection pool.
+
+    The base class issues a standalone HTTP/1.1 request per call. This subclass
+    keeps one httpx client so that the many small requests made while exporting
+    and polling are multiplexed over a kept-alive connection. Response handling
+    mirrors RestApiConnection.
+
+    `auth`, `_refresh`, and `_do_call` replace private methods of the base class,
+    so this class is tied to the ultra_rest_client version pinned in
+    requirements.txt and must be checked against it when the pin changes.
+
+    Attributes:
+        http (httpx.Client): The HTTP/2 client used for every request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the connection and its HTTP/2 client.
+
+        Args:
+            *args: Positional arguments for RestApiConnection.
+            **kwargs: Keyword arguments for RestApiConnection.
+        """
+        super().__init__(*args, **kwargs)
+        self.http = self._build_http_client()
+
+    def _build_http_client(self):
+        """
+        Build the HTTP/2 client, routing requests through the configured proxy.
+
+        The proxy uses the requests-style mapping accepted by RestApiConnection,
+        e.g. {"https": "http://proxy:3128"}.
+
+        Returns:
+            httpx.Client: The client used for every request.
+
+        Raises:
+            TypeError: If the proxy is not a mapping of scheme to proxy URL.
+        """
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        if self.proxy is not None and not isinstance(self.proxy, dict):
+            raise TypeError(f"Expected the proxy to be a dict of scheme to proxy URL, got {self.proxy!r}.")
+        mounts = {
+            scheme if "://" in scheme else f"{scheme}://": httpx.HTTPTransport(
+                http2=True, limits=limits, verify=self.verify_https, proxy=url
+            )
+            for scheme, url in (self.proxy or {}).items()
+            if url
+        }
+        return httpx.Client(
+            http2=True,
+            limits=limits,
+            timeout=30,
+            verify=self.verify_https,
+            mounts=mounts or None,
+        )
+
+    def set_proxy(self, proxy):
+        """
+        Update the proxy configuration and rebuild the HTTP/2 client to use it.
+
+        Args:
+            proxy (dict): The requests-style mapping of scheme to proxy URL, or None.
+        """
+        super().set_proxy(proxy)
+        self.http.close()
+        self.http = self._build_http_client()
+
+    def auth(self, username, password):
+        """
+        Authenticate with a username and password.
+
+        Args:
+            username (str): The UltraDNS username.
+            password (str): The UltraDNS password.
+
+        Raises:
+            AuthError: If authentication fails.
+        """
+        self._request_token({"grant_type": "password", "username": username, "password": password})
+
+    def _refresh(self):
+        """
+        Exchange the refresh token for a new access token.
+
+        Raises:
+            AuthError: If the refresh fails.
+        """
+        self._request_token({"grant_type": "refresh_token", "refresh_token": self.refresh_token})
+
+    def _request_token(self, payload):
+        """
+        Request an access token and store the returned tokens.
+
+        Args:
+            payload (dict): The token request form data.
+
+        Raises:
+            AuthError: If UltraDNS rejects the request.
+        """
+        response = self.http.post(f"{self._get_connection()}/v1/authorization/token", data=payload)
+        if response.status_code != httpx.codes.OK:
+            raise AuthError(response.json())
+        json_body = response.json()
+        self.access_token = json_body.get("accessToken")
+        self.refresh_token = json_body.get("refreshToken")
+
+    def _do_call(self, uri, method, params=None, body=None, retry=True, files=None, content_type="application/json"):
+        """
+        Send a request and decode the response the same way RestApiConnection does.
+
+        Args:
+            uri (str): The API path.
+            method (str): The HTTP method.
+            params (dict, optional): Query parameters. Defaults to None.
+            body (str, optional): The request body. Defaults to None.
+            retry (bool, optional): Whether to refresh the token and retry once on an
+                expired token. Defaults to True.
+            files (dict, optional): Multipart files. Defaults to None.
+            content_type (str, optional): The request content type. Defaults to "application/json".
+
+        Returns:
+            The decoded response: a dict or list for JSON, str for plain text, or bytes for zip archives.
+        """
+        response = self.http.request(
+            method,
+            self._get_connection() + uri,
+            params=params,
+            content=body,
+            files=files,
+            headers=self._build_headers(content_type),
+        )
+        if response.status_code == httpx.codes.NO_CONTENT:
+            return {}
+
+        if response.status_code == httpx.codes.TOO_MANY_REQUESTS:
+            time.sleep(1)
+            return self._do_call(uri, method, params, body, False)
+
+        response_type = response.headers.get("content-type", "").split(";")[0].strip()
+        if response_type == "text/plain":
+            return response.text
+        # Batch zone exports are returned as zip archives.
+        if response_type == "application/zip":
+            return response.content
+
+        try:
+            json_body = response.json()
+        except ValueError:
+            json_body = {}
+
+        # Background tasks report their task ID or location in the headers.
+        if response.status_code == httpx.codes.ACCEPTED:
+            if "x-task-id" in response.headers:
+                json_body.update({"task_id": response.headers["x-task-id"]})
+            if "location" in response.headers:
+                json_body.update({"location": response.headers["location"]})
+
+        if isinstance(json_body, dict) and retry and json_body.get("errorCode") == 60001:
+            self._refresh()
+            return self._do_call(uri, method, params, body, False)
+
+        return json_body
 
 
 class UltraDNSClient:
@@ -14,11 +210,36 @@ class UltraDNSClient:
     - Handling task-based operations (e.g., zone exports and health checks) with polling.
 
     The class abstracts API interactions and ensures error handling for common operations.
+    A single shared instance should be obtained with `get_instance` so that the
+    authenticated connection is reused across Slack commands.
 
     Attributes:
-        client (RestApiConnection): Authenticated connection to the UltraDNS API.
+        client (Http2RestApiConnection): Authenticated connection to the UltraDNS API.
     """
 
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, username, password):
+        """
+        Return the shared UltraDNSClient, authenticating on first use.
+
+        Args:
+            username (str): The UltraDNS username for authentication.
+            password (str): The UltraDNS password for authentication.
+
+        Returns:
+            UltraDNSClient: The shared, authenticated client.
+
+        Raises:
+            RuntimeError: If authentication with UltraDNS fails.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(username, password)
+            return cls._instance
+
     def __init__(self, username, password):
         """
         Initialize the UltraDNSClient.
@@ -30,11 +251,24 @@ class UltraDNSClient:
         Raises:
             RuntimeError: If authentication with UltraDNS fails.
         """
-        self.client = RestApiConnection()
-        try:
-            self.client.auth(username, password)
-        except Exception as e:
-            raise RuntimeError(f"Failed to authenticate with UltraDNS: {e}")
+        self._username = username
+        self._password = password
+        self._auth_lock = threading.Lock()
+        self.client = Http2RestApiConnection()
+        self._authenticate()
+
+    def _authenticate(self):
+        """
+        Authenticate with UltraDNS and store fresh access and refresh tokens.
+
+        Raises:
+            RuntimeError: If authentication with UltraDNS fails.
+        """
+        with self._auth_lock:
+            try:
+                self.client.auth(self._username, self._password)
+            except Exception as e:
+                raise RuntimeError(f"Failed to authenticate with UltraDNS: {e}")
 
     def fetch_system_status(self):
         """
@@ -69,11 +303,28 @@ class UltraDNSClient:
         Raises:
             ValueError: If the zone does not exist.
         """
-        self._validate_zone_exists(zone_name)
         task_id = self._initiate_zone_export([zone_name])
         self._poll_task_status(task_id)
         return self._download_exported_data(task_id)
 
+    def fetch_zone_data_bulk(self, zone_names):
+        """
+        Fetch zone data for several zones with a single export task.
+
+        Args:
+            zone_names (list): The names of the zones to fetch.
+
+        Returns:
+            dict: Maps each zone name to its raw zone data. Zones that could not be
+            found in the export result are left out.
+
+        Raises:
+            ValueError: If UltraDNS rejects the export (e.g., a zone does not exist).
+        """
+        task_id = self._initiate_zone_export(zone_names)
+        self._poll_task_status(task_id)
+        return self._split_export(self._download_exported_data(task_id), zone_names)
+
     def fetch_health_check(self, zone_name):
         """
         Fetch health check for a specific zone.
@@ -87,14 +338,44 @@ class UltraDNSClient:
         Raises:
             ValueError: If the zone does not exist.
         """
-        self._validate_zone_exists(zone_name)
         location = self._initiate_health_check(zone_name)
         return self._download_health_check(location)
 
+    def fetch_health_checks(self, zone_names):
+        """
+        Fetch health checks for several zones, polling them together on the calling thread.
+
+        All health checks are started first and then polled in a single backoff
+        loop, so concurrent checks do not each hold a thread while they wait.
+
+        Args:
+            zone_names (list): The names of the zones to check.
+
+        Returns:
+            dict: Maps each zone name to its health check result in JSON format,
+            or to the exception raised while checking that zone.
+        """
+        results = {}
+        locations = {}
+        for zone_name in zone_names:
+            try:
+                locations[zone_name] = self._initiate_health_check(zone_name)
+            except Exception as e:
+                results[zone_name] = e
+
+        for zone_name, response in self._poll_all(locations, self._health_check_complete).items():
+            results[zone_name] = response if isinstance(response, Exception) else json.dumps(response)
+        return results
+
+    @_reauth_on_auth_error
     def _validate_zone_exists(self, zone_name):
         """
         Validate if the zone exists in UltraDNS.
 
+        The fetch methods rely on the export and health check endpoints to report
+        missing zones, so this pre-flight check is only needed by callers that
+        want to validate a zone without starting a task.
+
         Args:
             zone_name (str): The name of the zone to validate.
 
@@ -102,14 +383,28 @@ class UltraDNSClient:
             ValueError: If the zone does not exist or the response format is unexpected.
         """
         response = self.client.get(f"/v3/zones/{zone_name}")
-        if isinstance(response, list):
-            # Check if it's an error message
+        self._raise_for_error(response, zone_name)
+        if not isinstance(response, dict):
+            raise ValueError(f"Unexpected response format while validating zone {zone_name}: {response}")
+
+    @staticmethod
+    def _raise_for_error(response, zone_name):
+        """
+        Raise if an UltraDNS response is an error message list.
+
+        Args:
+            response: The response body returned by the API.
+            zone_name (str): The zone the request was for, used in the error message.
+
+        Raises:
+            ValueError: If the response carries an UltraDNS error message.
+        """
+        if isinstance(response, list) and response:
             error = response[0]
             if isinstance(error, dict) and "errorMessage" in error:
-                raise ValueError(f"Zone validation failed: {error['errorMessage']}")
-        elif not isinstance(response, dict):
-            raise ValueError(f"Unexpected response format while validating zone {zone_name}: {response}")
+                raise ValueError(f"Zone validation failed for {zone_name}: {error['errorMessage']}")
 
+    @_reauth_on_auth_error
     def _initiate_zone_export(self, zone_names):
         """
         Initiate a zone export task.
@@ -121,12 +416,14 @@ class UltraDNSClient:
             str: The task ID for the initiated export.
 
         Raises:
-            RuntimeError: If the task initiation fails.
+            ValueError: If UltraDNS rejects the export (e.g., a zone does not exist).
         """
         payload = {"zoneNames": zone_names}
         response = self.client.post("/v3/zones/export", json.dumps(payload))
+        self._raise_for_error(response, ", ".join(zone_names))
         return response["task_id"]
 
+    @_reauth_on_auth_error
     def _poll_task_status(self, task_id):
         """
         Poll the status of a task until it completes.
@@ -137,14 +434,14 @@ class UltraDNSClient:
         Raises:
             Exception: If the task fails or encounters an error.
         """
-        while True:
-            response = self.client.get(f"/tasks/{task_id}")
-            if response["code"] == "COMPLETE":
-                break
+        def is_complete(response):
             if response["code"] == "ERROR":
                 raise Exception(f"Error processing task {task_id}: {response}")
-            time.sleep(10)
+            return response["code"] == "COMPLETE"
+
+        self._poll(f"/tasks/{task_id}", is_complete)
 
+    @_reauth_on_auth_error
     def _download_exported_data(self, task_id):
         """
         Download the exported data for a completed task.
@@ -157,6 +454,87 @@ class UltraDNSClient:
         """
         return self.client.get(f"/tasks/{task_id}/result")
 
+    @staticmethod
+    def _split_export(data, zone_names):
+        r"""
+        Split an export result into per-zone BIND data.
+
+        Single-zone exports are returned as text, while batch exports are returned
+        as a zip archive with one member per zone. Members are matched to zones by
+        their file name, so `$ORIGIN` lines inside a zone never split it. Only a
+        member or text whose name does not identify a zone is split by the
+        `$ORIGIN` lines naming the requested zones, appending every section to
+        its zone so a zone that switches back to its apex keeps all its records.
+
+        Args:
+            data (str or bytes): The export result.
+            zone_names (list): The names of the exported zones.
+
+        Returns:
+            dict: Maps each zone name found in the result to its raw zone data.
+
+        Example:
+            >>> lines = ["$ORIGIN a.com.", "@ SOA ns1 host 1 2 3 4 5", "$ORIGIN www.a.com.",
+            ...          "@ A 192.0.2.1", "$ORIGIN a.com.", "mail A 192.0.2.2",
+            ...          "$ORIGIN b.com.", "@ A 192.0.2.3"]
+            >>> zones = UltraDNSClient._split_export("\n".join(lines), ["a.com", "b.com"])
+            >>> zones["a.com"].splitlines() == lines[:6]
+            True
+        """
+        if isinstance(data, str) and len(zone_names) == 1:
+            return {zone_names[0]: data}
+
+        zones = {zone_name.rstrip(".").lower(): zone_name for zone_name in zone_names}
+        results = {}
+        unmatched = []
+        if isinstance(data, bytes):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                for member in archive.namelist():
+                    if member.endswith("/"):
+                        continue
+                    text = archive.read(member).decode()
+                    zone_name = UltraDNSClient._zone_for_member(member, zones)
+                    if zone_name is None:
+                        unmatched.append(text)
+                    else:
+                        results[zone_name] = text
+        else:
+            unmatched.append(data)
+
+        for text in unmatched:
+            current, lines = None, []
+            for line in text.splitlines(keepends=True):
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].upper() == "$ORIGIN" and parts[1].rstrip(".").lower() in zones:
+                    if current is not None:
+                        results[current] = results.get(current, "") + "".join(lines)
+                        lines = []
+                    current = zones[parts[1].rstrip(".").lower()]
+                lines.append(line)
+            if current is not None:
+                results[current] = results.get(current, "") + "".join(lines)
+        return results
+
+    @staticmethod
+    def _zone_for_member(member, zones):
+        """
+        Match a zip archive member to a requested zone by its file name.
+
+        Args:
+            member (str): The member's path in the archive (e.g., "a.com.txt").
+            zones (dict): Maps each normalized zone name to the requested name.
+
+        Returns:
+            str: The requested zone name, or None if the name does not identify one.
+        """
+        name = member.rsplit("/", 1)[-1].lower()
+        for candidate in (name, name.rsplit(".", 1)[0]):
+            zone_name = zones.get(candidate.rstrip("."))
+            if zone_name is not None:
+                return zone_name
+        return None
+
+    @_reauth_on_auth_error
     def _initiate_health_check(self, zone_name):
         """
         Initiate a health check task.
@@ -168,11 +546,13 @@ class UltraDNSClient:
             str: The location of the health check task.
 
         Raises:
-            RuntimeError: If the task initiation fails.
+            ValueError: If UltraDNS rejects the health check (e.g., the zone does not exist).
         """
         response = self.client.post(f"/v1/zones/{zone_name}/healthchecks", json.dumps({}))
+        self._raise_for_error(response, zone_name)
         return response["location"]
 
+    @_reauth_on_auth_error
     def _download_health_check(self, location):
         """
         Wait for a health check to complete and download its results.
@@ -186,10 +566,98 @@ class UltraDNSClient:
         Raises:
             Exception: If the health check fails or encounters an error.
         """
-        while True:
-            response = self.client.get(location)
-            if response["state"] == "COMPLETED":
-                return json.dumps(response)
-            if response["state"] == "FAILED":
-                raise Exception(f"Error processing health check: {response}")
-            time.sleep(10)
+        return json.dumps(self._poll(location, self._health_check_complete))
+
+    @staticmethod
+    def _health_check_complete(response):
+        """
+        Check whether a health check has finished.
+
+        Args:
+            response (dict): The health check status response.
+
+        Returns:
+            bool: True if the health check has completed.
+
+        Raises:
+            Exception: If the health check failed.
+        """
+        if response["state"] == "FAILED":
+            raise Exception(f"Error processing health check: {response}")
+        return response["state"] == "COMPLETED"
+
+    def _poll(self, url, predicate, **kwargs):
+        """
+        Poll a URL with exponential backoff and jitter until a predicate is satisfied.
+
+        Args:
+            url (str): The URL to poll.
+            predicate (function): Called with each response; returns True once the
+                operation is done, and may raise to signal a failure.
+            **kwargs: Backoff settings passed through to `_poll_all`.
+
+        Returns:
+            dict: The response that satisfied the predicate.
+
+        Raises:
+            TimeoutError: If the predicate is not satisfied in time.
+        """
+        response = self._poll_all({url: url}, predicate, **kwargs)[url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def _poll_all(self, urls, predicate, initial=0.25, cap=5.0, max_total=300):
+        """
+        Poll several URLs in one backoff loop until each satisfies a predicate.
+
+        Args:
+            urls (dict): Maps a caller-chosen key to the URL to poll.
+            predicate (function): Called with each response; returns True once the
+                operation is done, and may raise to signal a failure.
+            initial (float, optional): First delay in seconds. Defaults to 0.25.
+            cap (float, optional): Maximum delay in seconds, before jitter. Defaults to 5.0.
+            max_total (float, optional): Maximum total wait in seconds. Defaults to 300.
+
+        Returns:
+            dict: Maps each key to the response that satisfied the predicate, or to
+            the exception raised while polling it (TimeoutError if it ran out of time).
+        """
+        results = {}
+        pending = dict(urls)
+        deadline = time.monotonic() + max_total
+        attempt = 0
+        while pending:
+            for key, url in list(pending.items()):
+                try:
+                    response = self._get(url)
+                    if not predicate(response):
+                        continue
+                    results[key] = response
+                except Exception as e:
+                    results[key] = e
+                del pending[key]
+            if not pending:
+                break
+            delay = min(cap, initial * (1.6 ** attempt))
+            delay += random.uniform(0, 0.2 * delay)
+            if time.monotonic() + delay > deadline:
+                for key, url in pending.items():
+                    results[key] = TimeoutError(f"Timed out after {max_total} seconds polling {url}")
+                break
+            time.sleep(delay)
+            attempt += 1
+        return results
+
+    @_reauth_on_auth_error
+    def _get(self, url):
+        """
+        Issue a GET request against the UltraDNS API.
+
+        Args:
+            url (str): The URL or path to fetch.
+
+        Returns:
+            dict: The response body.
+        """
+        return self.client.get(url)
@@ -1,7 +1,245 @@
+import functools
+import json
+import textwrap
+import threading
 from asst_client import AssistantClient
+from resp_cache import ResponseCache
 from slackstyler import SlackStyler
 
 
+def _preamble(text):
+    """
+    Normalize a static prompt preamble so it is byte-identical on every request.
+
+    Args:
+        text (str): The raw, indented preamble text.
+
+    Returns:
+        str: The dedented and stripped preamble.
+    """
+    return textwrap.dedent(text).strip()
+
+
+# Static instruction blocks, sent ahead of the variable payload so that every
+# request for the same assistant shares an identical prompt prefix.
+STATUS_PREAMBLE = _preamble("""
+    Analyze the following UltraDNS system status JSON response. Provide a summary of the current state of the system in a conversational format. Focus on:
+    - Whether all services are operational or if any are down/degraded.
+    - Highlighting any affected services with their names and the most recent update timestamps.
+    - Summarizing upcoming maintenance, including affected services, scheduled times, and potential impacts.
+    - If there are active incidents, briefly describe them and the affected services.
+
+    If all services are operational with no issues or maintenance, state "All systems are operational, and no upcoming maintenance is scheduled."
+
+    The payload is the JSON system status.
+""")
+
+ZONE_PREAMBLE = _preamble("""
+    Analyze the following DNS zone file for compliance with DNS standards and best practices. Only make suggestions if there are clear issues or meaningful opportunities for optimization. If everything is in order, state "No issues detected." Do NOT provide any suggestions regarding the SOA record unless explicitly requested. Tags should focus on DNS-specific themes.
+
+    Return your response in this format:
+    Suggestions:
+    - Suggestion 1
+    - Suggestion 2
+
+    Tags (JSON):
+    {
+      "tags": ["meaningful-tag1", "meaningful-tag2"]
+    }
+
+    The payload is the zone file.
+""")
+
+HEALTHCHECK_PREAMBLE = _preamble("""
+    Analyze the following DNS health check JSON response. Summarize the overall status of each category, highlight critical issues or warnings, and provide actionable recommendations for improvement. Include the description and relevant messages from the JSON to provide context for your recommendations. If everything is in order, state "No issues detected."
+
+    Do not restate successful checks unless they add critical context. Focus on items with a status of "ERROR", "WARNING", or "BEST_PRACTICE".
+
+    Your response format should be a general summary of the issues identified in the health check. Provide it in a conversational, human-readable format and not a list.
+
+    The payload is the health check JSON.
+""")
+
+DNS_HELPER_PREAMBLE = _preamble("""
+    Answer the following question about the Domain Name System (DNS). Provide a clear and accurate response based on relevant RFCs and DNS best practices. If the question is unrelated to DNS, respond with: "I'm sorry, but I am an assistant specifically designed for answering DNS questions. I can't help with that."
+
+    The payload is the question.
+""")
+
+# The dns_helper fast path answers with a small model first, and hands the
+# question to the full assistant when the small model declines or is unsure.
+ESCALATE_TAG = "[ESCALATE]"
+DNS_REFUSAL = "I can't help with that"
+DNS_FAST_PREAMBLE = (
+    f"{DNS_HELPER_PREAMBLE}\n\n"
+    f"If you are not confident that your answer is complete and accurate, reply with only {ESCALATE_TAG}."
+)
+
+# Health check results with these statuses are dropped before analysis; the
+# preamble already tells the assistant to skip them.
+_PASSING_STATUSES = {"OK", "PASSED", "N_A"}
+
+
+def _minify(obj):
+    """
+    Serialize an object to JSON without insignificant whitespace.
+
+    Args:
+        obj: The object to serialize.
+
+    Returns:
+        str: The compact JSON string.
+    """
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _compact_status(status):
+    """
+    Reduce a system status JSON payload to the parts worth analyzing.
+
+    Keeps the overall status, incidents, and maintenance, and only the
+    components that are not operational.
+
+    Args:
+        status (str): The JSON response from the UltraDNS system status page.
+
+    Returns:
+        str: The compacted JSON, or the original payload if it cannot be parsed.
+    """
+    try:
+        data = json.loads(status)
+    except (TypeError, ValueError):
+        return status
+    if not isinstance(data, dict):
+        return _minify(data)
+
+    compact = {key: data[key] for key in ("status_overall", "incidents", "maintenance") if key in data}
+    components = data.get("status")
+    if isinstance(components, list):
+        compact["status"] = [
+            component for component in components
+            if not isinstance(component, dict) or component.get("status_code") != 100
+        ]
+    return _minify(compact or data)
+
+
+def _drop_passing(node):
+    """
+    Recursively drop passing results from a health check structure.
+
+    A result is dropped when it is a dict with a passing status whose nested
+    lists (e.g., an empty `messages` array) are empty once passing entries were
+    removed from them. Categories, which carry a `results` list, are always kept
+    so their overall status is still reported when every check passed.
+
+    Args:
+        node: A parsed JSON value.
+
+    Returns:
+        The value with passing results removed.
+    """
+    if isinstance(node, dict):
+        return {key: _drop_passing(value) for key, value in node.items()}
+    if isinstance(node, list):
+        items = [_drop_passing(item) for item in node]
+        return [
+            item for item in items
+            if not (
+                isinstance(item, dict)
+                and "results" not in item
+                and item.get("status") in _PASSING_STATUSES
+                and not any(isinstance(value, list) and value for value in item.values())
+            )
+        ]
+    return node
+
+
+def _compact_healthcheck(healthcheck):
+    """
+    Reduce a health check JSON payload to the results worth analyzing.
+
+    Args:
+        healthcheck (str): The JSON response from a health check.
+
+    Returns:
+        str: The compacted JSON, or the original payload if it cannot be parsed.
+    """
+    try:
+        return _minify(_drop_passing(json.loads(healthcheck)))
+    except (TypeError, ValueError):
+        return healthcheck
+
+
+def _compact_zone_file(zone_file):
+    """
+    Strip comments and redundant whitespace from a BIND zone file.
+
+    Whitespace is only collapsed on lines without quoted strings, so TXT record
+    contents are left untouched. Lines that start with whitespace keep a single
+    leading space, since BIND reads them as continuing the previous owner name.
+
+    Args:
+        zone_file (str): The raw zone file.
+
+    Returns:
+        str: The compacted zone file.
+    """
+    lines = []
+    for line in zone_file.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith(";"):
+            continue
+        indent = " " if line[:1].isspace() else ""
+        lines.append(indent + (stripped if '"' in line else " ".join(line.split())))
+    return "\n".join(lines)
+
+
+# Characters that need the styler: markdown syntax, plus the characters Slack
+# requires to be escaped. Text without any of them is sent as-is.
+_STYLED_CHARS = frozenset("*_`#[]>~<&")
+# mistune parsers keep per-call state, so each thread gets its own SlackStyler.
+_styler = threading.local()
+
+
+def _style(text):
+    """
+    Convert markdown to Slack formatting, skipping the parser for plain text.
+
+    Args:
+        text (str): The assistant's response.
+
+    Returns:
+        str: The Slack-formatted text.
+    """
+    if _STYLED_CHARS.isdisjoint(text):
+        return text
+    if not hasattr(_styler, "instance"):
+        _styler.instance = SlackStyler()
+    return _styler.instance.convert(text)
+
+
+_assistant_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_assistant(assistant_name):
+    return AssistantClient(assistant_name)
+
+
+def get_assistant(assistant_name):
+    """
+    Return the shared AssistantClient for an assistant, creating it on first use.
+
+    Args:
+        assistant_name (str): The name of the assistant (e.g., "zone_analyzer").
+
+    Returns:
+        AssistantClient: The client reused for every request to that assistant.
+    """
+    with _assistant_lock:
+        return _cached_assistant(assistant_name)
+
+
 class InferenceClient:
     """
     The InferenceClient class provides methods to interact with various assistants
@@ -12,148 +250,169 @@ class InferenceClient:
         """
         Initialize the InferenceClient.
 
-        No arguments are required for initialization. The client will dynamically
-        instantiate AssistantClient instances for specific assistant interactions.
+        No arguments are required for initialization. The client lazily creates one
+        shared AssistantClient per assistant (see `get_assistant`), and keeps a
+        ResponseCache so repeated prompts skip the assistant run.
         """
-        pass
+        self.cache = ResponseCache()
 
-    def status_check(self, status, say):
+    def status_check(self, status):
         """
         Perform a system status check analysis using the OpenAI Assistant.
 
         Args:
             status (str): The JSON response from the UltraDNS system status page.
-            say (function): The Slack say function to send messages to a Slack channel.
 
-        Raises:
-            Exception: If any error occurs during the assistant interaction.
+        Returns:
+            str: The Slack-formatted analysis, or an error message if the assistant run fails.
         """
         try:
-            asst_client = AssistantClient("system_status")
-            prompt = f"""
-            Analyze the following UltraDNS system status JSON response. Provide a summary of the current state of the system in a conversational format. Focus on:
-            - Whether all services are operational or if any are down/degraded.
-            - Highlighting any affected services with their names and the most recent update timestamps.
-            - Summarizing upcoming maintenance, including affected services, scheduled times, and potential impacts.
-            - If there are active incidents, briefly describe them and the affected services.
-
-            If all services are operational with no issues or maintenance, state "All systems are operational, and no upcoming maintenance is scheduled."
-
-            JSON System Status:
-            {status}
-            """
-            raw_messages = asst_client.run_assistant(prompt)
-            self._process_response(raw_messages, say)
+            return self._run_prompt("system_status", STATUS_PREAMBLE, _compact_status(status))
         except Exception as e:
-            say(f"Error during assistant run: {e}")
+            return f"Error during assistant run: {e}"
 
-    def zone_inference(self, zone_file, say):
+    def zone_inference(self, zone_file):
         """
         Perform DNS zone file analysis using the OpenAI Assistant.
 
         Args:
             zone_file (str): The content of the DNS zone file to analyze.
-            say (function): The Slack say function to send messages to a Slack channel.
 
-        Raises:
-            Exception: If any error occurs during the assistant interaction.
+        Returns:
+            str: The Slack-formatted analysis, or an error message if the assistant run fails.
         """
         try:
-            asst_client = AssistantClient("zone_analyzer")
-            prompt = f"""
-            Analyze the following DNS zone file for compliance with DNS standards and best practices. Only make suggestions if there are clear issues or meaningful opportunities for optimization. If everything is in order, state "No issues detected." Do NOT provide any suggestions regarding the SOA record unless explicitly requested. Tags should focus on DNS-specific themes.
-
-            Return your response in this format:
-            Suggestions:
-            - Suggestion 1
-            - Suggestion 2
-
-            Tags (JSON):
-            {{
-              "tags": ["meaningful-tag1", "meaningful-tag2"]
-            }}
-
-            Zone file:
-            {zone_file}
-            """
-            raw_messages = asst_client.run_assistant(prompt)
-            self._process_response(raw_messages, say)
+            return self._run_prompt("zone_analyzer", ZONE_PREAMBLE, _compact_zone_file(zone_file))
         except Exception as e:
-            say(f"Error during assistant run: {e}")
+            return f"Error during assistant run: {e}"
 
-    def zone_healthcheck(self, healthcheck, say):
+    def zone_healthcheck(self, healthcheck):
         """
         Perform a zone health check analysis using the OpenAI Assistant.
 
         Args:
             healthcheck (str): The JSON response from a health check to analyze.
-            say (function): The Slack say function to send messages to a Slack channel.
 
-        Raises:
-            Exception: If any error occurs during the assistant interaction.
+        Returns:
+            str: The Slack-formatted analysis, or an error message if the assistant run fails.
         """
         try:
-            asst_client = AssistantClient("zone_healthcheck")
-            prompt = f"""
-            Analyze the following DNS health check JSON response. Summarize the overall status of each category, highlight critical issues or warnings, and provide actionable recommendations for improvement. Include the description and relevant messages from the JSON to provide context for your recommendations. If everything is in order, state "No issues detected."
-
-            Do not restate successful checks unless they add critical context. Focus on items with a status of "ERROR", "WARNING", or "BEST_PRACTICE".
-
-            Your response format should be a general summary of the issues identified in the health check. Provide it in a conversational, human-readable format and not a list.
-
-            Health check JSON:
-            {healthcheck}
-            """
-            raw_messages = asst_client.run_assistant(prompt)
-            self._process_response(raw_messages, say)
+            return self._run_prompt("zone_healthcheck", HEALTHCHECK_PREAMBLE, _compact_healthcheck(healthcheck))
         except Exception as e:
-            say(f"Error during assistant run: {e}")
+            return f"Error during assistant run: {e}"
 
-    def dns_helper(self, question, say):
+    def dns_helper(self, question, say, user=None):
         """
         Answer general DNS questions using the OpenAI Assistant.
 
+        New questions are first tried against a small, fast model and only sent to
+        the assistant if it declines or flags uncertainty. A fast answer is recorded
+        in the user's conversation thread, so follow-ups, which go straight to the
+        assistant, keep the context of the earlier exchange.
+
         Args:
             question (str): The DNS-related question to answer.
             say (function): The Slack say function to send messages to a Slack channel.
+            user (str, optional): The Slack user ID asking the question. When given,
+                the user's conversation thread is continued. Defaults to None.
 
         Raises:
             Exception: If any error occurs during the assistant interaction.
         """
         try:
-            asst_client = AssistantClient("dns_helper")
-            prompt = f"""
-            Answer the following question about the Domain Name System (DNS). Provide a clear and accurate response based on relevant RFCs and DNS best practices. If the question is unrelated to DNS, respond with: "I'm sorry, but I am an assistant specifically designed for answering DNS questions. I can't help with that."
-
-            Question:
-            {question}
-            """
-            raw_messages = asst_client.run_assistant(prompt)
-            self._process_response(raw_messages, say)
+            asst_client = get_assistant("dns_helper")
+            if user is None or not asst_client.has_thread(user):
+                answer = self._fast_dns_answer(question)
+                if answer:
+                    say(_style(answer))
+                    if user is not None:
+                        self._record_fast_answer(asst_client, user, question, answer)
+                    return
+            say(self._run_prompt("dns_helper", DNS_HELPER_PREAMBLE, question, thread_key=user))
         except Exception as e:
             say(f"Error during assistant run: {e}")
 
     @staticmethod
-    def _process_response(raw_messages, say):
+    def _fast_dns_answer(question):
         """
-        Parse and style the response from the assistant.
+        Try to answer a DNS question with the small model.
 
         Args:
-            raw_messages (list): A list of raw message objects returned by the assistant.
-            say (function): The Slack say function to send messages to a Slack channel.
+            question (str): The DNS-related question to answer.
 
-        Raises:
-            Exception: If the response is empty or cannot be processed.
+        Returns:
+            str: The answer, or None if the question should go to the full assistant.
+        """
+        try:
+            answer = get_assistant("dns_helper").complete(DNS_FAST_PREAMBLE, question)
+        except RuntimeError:
+            return None
+        if not answer.strip() or ESCALATE_TAG in answer or DNS_REFUSAL in answer:
+            return None
+        return answer
+
+    @staticmethod
+    def _record_fast_answer(asst_client, user, question, answer):
+        """
+        Record a fast answer in the user's conversation thread.
+
+        The answer has already been sent, so a failure is not reported to the user;
+        the conversation simply has no thread yet and the next question takes the
+        fast path again.
+
+        Args:
+            asst_client (AssistantClient): The dns_helper assistant client.
+            user (str): The Slack user ID that asked the question.
+            question (str): The question that was answered.
+            answer (str): The fast model's answer.
+        """
+        try:
+            asst_client.record_exchange(user, question, answer, preamble=DNS_HELPER_PREAMBLE)
+        except RuntimeError:
+            pass
+
+    def _run_prompt(self, assistant_name, preamble, payload, thread_key=None):
+        """
+        Send a prompt to an assistant, answering from the response cache when possible.
+
+        Prompts that continue a conversation bypass the response cache, since
+        their answers depend on the earlier messages in the thread.
+
+        Args:
+            assistant_name (str): The name of the assistant (e.g., "zone_analyzer").
+            preamble (str): The static instructions for this kind of request.
+            payload (str): The variable content to analyze or answer.
+            thread_key (str, optional): Key of the conversation to continue. Defaults to None.
+
+        Returns:
+            str: The Slack-formatted response.
+        """
+        key = None
+        if thread_key is None:
+            key = ResponseCache.make_key(assistant_name, f"{preamble}\n{payload}")
+            cached = self.cache.get(key)
+            if cached:
+                return _style(cached)
+
+        asst_client = get_assistant(assistant_name)
+        chunks = asst_client.run_assistant(payload, preamble=preamble, thread_key=thread_key)
+        return self._process_response(chunks, key)
+
+    def _process_response(self, chunks, key):
+        """
+        Collect, style, and cache the streamed response from the assistant.
+
+        Args:
+            chunks (iterable): Chunks of response text streamed by the assistant.
+            key (tuple): The response cache key for the prompt, or None to skip caching.
+
+        Returns:
+            str: The Slack-formatted response, or a notice if the response was empty.
         """
-        response_text = ""
-        for message in raw_messages:
-            if message.role == "assistant":
-                for part in message.content:
-                    if part.type == "text" and hasattr(part, "text") and hasattr(part.text, "value"):
-                        response_text += part.text.value
+        response_text = "".join(chunks)
 
         if response_text:
-            styler = SlackStyler()
-            say(styler.convert(response_text))
-        else:
-            say("The assistant's response was empty.")
+            if key is not None:
+                self.cache.set(key, response_text)
+            return _style(response_text)
+        return "The assistant's response was empty."
@@ -1,176 +1,123 @@
-import json
+import asyncio
+import functools
+import hashlib
 import os
+import random
 import re
 import time
-from openai import OpenAI
+from pathlib import Path
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, NotFoundError, RateLimitError
 
-# Step 1: Retrieve API key from environment variables
-api_key = os.getenv("OPENAI_KEY")
-if not api_key:
-    raise EnvironmentError("OPENAI_KEY is not set in the environment variables.")
+# Prefer orjson for reading and writing the config when it is installed
+try:
+    import orjson as _json
 
-# Step 2: Initialize the OpenAI client
-client = OpenAI(api_key=api_key)
+    def _dumps(obj):
+        return _json.dumps(obj, option=_json.OPT_INDENT_2)
+except ImportError:
+    import json as _json
 
-# Step 3: Define the configuration file path in the /data directory
+    def _dumps(obj):
+        return _json.dumps(obj, indent=4).encode()
+
+# Step 1: Create the async OpenAI client lazily, only once an assistant needs to be created,
+# so the module can be imported without OPENAI_KEY set
+@functools.lru_cache(maxsize=1)
+def get_client():
+    """
+    Return the shared async OpenAI client, creating it on first use.
+
+    The client's own retries are disabled; `_with_retries` applies the only
+    retry policy.
+
+    Returns:
+        AsyncOpenAI: The client used to create assistants.
+
+    Raises:
+        EnvironmentError: If OPENAI_KEY is not set in the environment.
+    """
+    api_key = os.getenv("OPENAI_KEY")
+    if not api_key:
+        raise EnvironmentError("OPENAI_KEY is not set in the environment variables.")
+    return AsyncOpenAI(api_key=api_key, max_retries=0)
+
+# Step 2: Define the configuration file path in the /data directory
 config_file = "/data/config.json"
+config_dir = os.path.dirname(config_file)
+# Maps a hash of each assistant's instructions, version, and model to its ID, so
+# assistants can be reused when only config.json was lost
+assistant_cache_file = os.path.join(config_dir, "assistant_cache.json")
 
-# Step 4: Define instructions for the assistants
-# These include detailed task-specific instructions for zone analysis, DNS help, and health checks
+# Step 3: Define assistant versions
+# The detailed task-specific instructions live in prompts/<assistant>.md and are
+# only read when the assistants actually need to be created
 
 zone_analyzer_version = "v0.1"
-zone_analyzer_instructions = """
-You are a DNS zone file expert. Your role is to analyze zone files provided by users for compliance with DNS standards, identify potential errors, recommend optimizations, and infer relevant tags. Only provide suggestions if there are clear issues or meaningful improvements to be made. Avoid redundant or generic comments.
-
-Special Instructions:
-- Do NOT critique or suggest changes to the SOA record unless explicitly instructed to do so.
-- Evaluate TTL values for appropriateness based on record type.
-- Check for duplicate or conflicting DNS records.
-- Verify that wildcard records are used correctly and do not overlap with specific subdomains.
-- Ensure required record types (e.g., A, CNAME, MX for domains hosting email) are present.
-- Suggest the use of DNSSEC if not already implemented to improve security.
-- Analyze the presence and correctness of SPF, DKIM, and DMARC records for email validation.
-- For domains prioritizing high availability, check for redundancy in NS records.
-- For global domains, ensure geographically distributed DNS servers are used.
-- Provide meaningful, DNS-specific tags related to the analysis.
-
-Provide suggestions that are actionable, concise, and clear. Avoid overly technical jargon unless necessary. Prioritize recommendations with a meaningful impact on performance, compliance, or security.
-
-Return your response in the following format:
-Suggestions:
-- Suggestion 1
-- Suggestion 2
-
-Tags (JSON):
-{
-  "tags": ["tag1", "tag2", "tag3"]
-}
-"""
-
 dns_helper_version = "v0.1"
-dns_helper_instructions = """
-You are a DNS expert assistant, designed to answer questions about the Domain Name System (DNS). Your primary role is to provide accurate, technically detailed answers to DNS-related questions. Your responses should reference relevant RFCs when applicable and include explanations suitable for both technical and non-technical audiences.
-
-Key Guidelines:
-- Respond only to DNS-related queries. For non-DNS topics, respond with: "I'm sorry, but I am an assistant specifically designed for answering DNS questions. I can't help with that."
-- Reference specific RFCs where applicable, including the RFC number and title. For example: "Refer to RFC 1035: 'Domain Names - Implementation and Specification' for more details."
-- Ensure explanations are concise and technically accurate, avoiding unnecessary jargon unless the question demands it.
-- Use lists or structured responses to organize information for clarity.
-- Include examples or scenarios to illustrate your answers, especially for DNS configurations or troubleshooting.
-
-Special Instructions:
-- Base responses on core DNS RFCs such as:
-  - RFC 1034: Domain Names - Concepts and Facilities
-  - RFC 1035: Domain Names - Implementation and Specification
-  - RFC 2181: Clarifications to the DNS Specification
-  - RFC 4033-4035: DNS Security Extensions (DNSSEC)
-  - RFC 7871: Client Subnet in DNS Queries (EDNS0)
-- Explain how DNS interacts with related protocols like DHCP, TCP/UDP, or HTTPS if relevant.
-- Be prepared to answer questions about:
-  - DNS record types (A, AAAA, MX, CNAME, etc.)
-  - DNSSEC and security considerations
-  - Recursive vs. authoritative DNS servers
-  - DNS over HTTPS (DoH) and DNS over TLS (DoT)
-  - Performance optimizations (e.g., TTL values, caching)
-  - Troubleshooting DNS issues (e.g., propagation delays, misconfigured records)
-
-Boundary Conditions:
-- If a user asks for advice beyond DNS, respond: "I'm sorry, but I am an assistant specifically designed for answering DNS questions. I can't help with that."
-- Do not attempt to answer speculative, non-technical, or irrelevant questions.
-
-Response Format:
-- For DNS questions, provide a detailed answer with references to RFCs and examples where applicable.
-- For non-DNS questions, respond: "I'm sorry, but I am an assistant specifically designed for answering DNS questions. I can't help with that."
-"""
-
 zone_healthcheck_version = "v0.1"
-zone_healthcheck_instructions = """
-You are a DNS health check expert assistant. Your primary role is to analyze the JSON response from a DNS health check API and provide a clear, actionable summary of the results, highlighting critical issues and suggesting best practices for improvement.
-
-Special Instructions:
-- Focus on identifying and summarizing errors and warnings with actionable recommendations. 
-- Highlight critical issues that could impact DNS resolution, security, or performance.
-- Avoid restating successful checks unless they provide valuable context to the user.
-- Reference relevant RFCs where applicable and ensure explanations are concise and technically accurate.
-- Use the `description` field of each health check to provide context for recommendations.
-- Avoid redundant or generic comments; focus on results that add value.
-
-For each `category` in the health check response:
-1. Summarize the overall `status` and state its significance.
-2. Highlight individual results with a status of "ERROR", "WARNING", or "BEST_PRACTICE".
-3. Include relevant `messages` from the results to provide context for the issue or recommendation.
-4. Skip results with a status of "OK" or "N_A" unless they provide critical context.
-
-When providing your response:
-- Use clear, structured formatting with headers for each category.
-- Organize recommendations with bullet points for clarity.
-- Provide references to relevant RFCs when applicable, including RFC numbers and short descriptions.
-
-Response Format:
-Category: [Category Name]
-- Overall Status: [Status]
-- Summary: [High-level summary of the category]
-
-Issues:
-- [Name of the check]
-  - Description: [Check description]
-  - Status: [Error/Warning/Best Practice]
-  - Message: [Message details]
-"""
-
 system_status_version = "v0.1"
-system_status_instructions = """
-You are a DNS system status expert assistant. Your primary role is to analyze the JSON response from the UltraDNS system status page and provide a clear, conversational summary of the current state of UltraDNS services. Your summary should help users quickly understand if there are any issues or planned maintenance that may impact their operations.
 
-Special Instructions:
-- Focus on whether services are operational or experiencing downtime. If everything is operational, reassure the user that all systems are functioning as expected.
-- Highlight any specific services that are down, degraded, or otherwise impacted. Include their names and the most recent update timestamp.
-- Summarize upcoming maintenance events, including the affected services, scheduled start and end times, and any potential impact.
-- If there are active incidents, include a brief description and mention the affected services or areas.
+# Resolved once; the prompts ship next to this script (see the Dockerfile)
+PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
+
+def _load(name):
+    """
+    Read an assistant's instructions from the prompts directory.
+
+    Args:
+        name (str): The assistant name (e.g., "zone_analyzer").
 
-When providing your response:
-- Use plain, conversational language that is clear and easy to understand.
-- Avoid unnecessary technical jargon; your goal is to inform users efficiently.
-- Structure your response logically, starting with the overall system status and then diving into specifics (e.g., affected services, maintenance, or incidents).
-- If everything is operational with no issues or maintenance, acknowledge this positively (e.g., "All systems are running smoothly.").
+    Returns:
+        str: The instructions text.
+    """
+    return (PROMPTS_DIR / f"{name}.md").read_text(encoding="utf-8")
 
-Response Format:
-- Begin with an overall status summary (e.g., "All UltraDNS services are operational.").
-- List any affected services, their current status, and the last update time.
-- Summarize upcoming maintenance, if any, with service names, scheduled times, and potential impacts.
-- Conclude with a brief reassuring note if appropriate (e.g., "You can proceed with confidence.").
-"""
+# Step 4: Define a compiled regex for validating assistant IDs
+ASSISTANT_ID_RE = re.compile(r"^asst_[a-zA-Z0-9]{24}$")
 
-# Step 5: Define a regex pattern for validating assistant IDs
-assistant_id_pattern = r"^asst_[a-zA-Z0-9]{24}$"
+# Number of attempts made for each assistant request before giving up
+MAX_ATTEMPTS = 5
 
-def load_existing_ids():
+# Every assistant as (config key, name prefix, version, prompt name); adding an
+# assistant only takes a new row here and its prompts/<name>.md file
+ASSISTANTS = (
+    ("zone_analyzer_id", "zone-analyzer", zone_analyzer_version, "zone_analyzer"),
+    ("dns_helper_id", "dns-helper", dns_helper_version, "dns_helper"),
+    ("zone_healthcheck_id", "zone-healthcheck", zone_healthcheck_version, "zone_healthcheck"),
+    ("system_status_id", "system-status", system_status_version, "system_status"),
+)
+REQUIRED_IDS = tuple(key for key, *_ in ASSISTANTS)
+
+async def _with_retries(request):
     """
-    Check for existing assistant IDs in the configuration file.
+    Await an OpenAI request, retrying transient failures.
+
+    Rate limits, connection errors, and 5xx responses are retried up to
+    `MAX_ATTEMPTS` times with exponential backoff and jitter.
+
+    Args:
+        request (function): Called with no arguments; returns the request's awaitable.
+
+    Returns:
+        The request's result.
 
-    - If a valid configuration file exists with valid assistant IDs, exit initialization.
-    - If the file is corrupt or IDs are invalid, continue to create new assistants.
+    Raises:
+        Exception: Any non-transient error, or the last transient one once the attempts run out.
     """
-    if os.path.exists(config_file):
+    for attempt in range(MAX_ATTEMPTS):
         try:
-            with open(config_file, "r") as f:
-                data = json.load(f)
-            if (
-                re.match(assistant_id_pattern, data.get("zone_analyzer_id", ""))
-                and re.match(assistant_id_pattern, data.get("dns_helper_id", ""))
-                and re.match(assistant_id_pattern, data.get("zone_healthcheck_id", ""))
-                and re.match(assistant_id_pattern, data.get("system_status_id", ""))
-            ):
-                print("Valid assistant IDs already exist. Exiting initialization.")
-                exit(0)
-        except (json.JSONDecodeError, KeyError):
-            print("Invalid or corrupt config.json detected. Proceeding to recreate assistants.")
-    return None
-
-def create_assistant(name, description, instructions, model="gpt-4o"):
+            return await request()
+        except (RateLimitError, APIConnectionError, InternalServerError):
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+        await asyncio.sleep(2 ** attempt + random.random())
+
+async def create_assistant(name, description, instructions, model="gpt-4o"):
     """
     Create an assistant via the OpenAI API.
 
+    Transient failures are retried (see `_with_retries`).
+
     Args:
         name (str): Name of the assistant.
         description (str): Version or short description of the assistant.
@@ -184,65 +131,142 @@ def create_assistant(name, description, instructions, model="gpt-4o"):
         RuntimeError: If the assistant creation fails.
     """
     try:
-        response = client.beta.assistants.create(
+        response = await _with_retries(lambda: get_client().beta.assistants.create(
             name=name,
             description=description,
             instructions=instructions,
             model=model,
-        )
-        assistant_id = response.id
-        if not assistant_id or not re.match(assistant_id_pattern, assistant_id):
-            raise ValueError(f"Invalid assistant ID returned for {name}: {assistant_id}")
-        return assistant_id
+        ))
     except Exception as e:
         raise RuntimeError(f"Failed to create assistant '{name}': {e}")
 
-def main():
+    assistant_id = response.id
+    if not assistant_id or not ASSISTANT_ID_RE.match(assistant_id):
+        raise RuntimeError(f"Failed to create assistant '{name}': Invalid assistant ID returned for {name}: {assistant_id}")
+    return assistant_id
+
+def load_assistant_cache():
+    """
+    Load the assistant cache, which maps instruction hashes to assistant IDs.
+
+    Returns:
+        dict: The cached mapping, or an empty dict if the file is missing or corrupt.
+    """
+    try:
+        with open(assistant_cache_file, "rb") as f:
+            cache = _json.loads(f.read())
+    except (FileNotFoundError, _json.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def write_json(path, obj):
+    """
+    Atomically write an object as JSON.
+
+    The data is written to a temporary file and renamed into place, so an
+    interrupted write never leaves a truncated file behind.
+
+    Args:
+        path (str): The destination file.
+        obj: The object to serialize.
+    """
+    if not os.path.isdir(config_dir):
+        os.makedirs(config_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    payload = _dumps(obj)
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+async def get_or_create_assistant(cache, name, description, instructions, model="gpt-4o"):
+    """
+    Reuse a previously created assistant with identical settings, or create a new one.
+
+    Args:
+        cache (dict): The assistant cache from `load_assistant_cache`; updated on creation.
+        name (str): Name of the assistant.
+        description (str): Version or short description of the assistant.
+        instructions (str): Instructions defining the assistant's behavior.
+        model (str): The model to be used for the assistant (default is "gpt-4o").
+
+    Returns:
+        str: The assistant ID.
+
+    Raises:
+        RuntimeError: If looking up the cached assistant or creating a new one fails.
+    """
+    key = hashlib.sha256((instructions + description + model).encode()).hexdigest()
+    cached_id = cache.get(key)
+    if isinstance(cached_id, str) and ASSISTANT_ID_RE.match(cached_id):
+        try:
+            await _with_retries(lambda: get_client().beta.assistants.retrieve(cached_id))
+            return cached_id
+        except NotFoundError:
+            pass  # The assistant was deleted; create a new one.
+        except Exception as e:
+            raise RuntimeError(f"Failed to retrieve assistant '{cached_id}' for '{name}': {e}")
+
+    assistant_id = await create_assistant(name, description, instructions, model=model)
+    cache[key] = assistant_id
+    return assistant_id
+
+async def main():
     """
     Main logic for creating and saving assistant IDs.
 
-    - Check for existing assistant IDs using `load_existing_ids`.
-    - Create new assistants for zone analysis, DNS helper, and health check.
+    - Keep the valid assistant IDs from an existing configuration file.
+    - Reuse or create, concurrently, only the assistants whose IDs are missing or invalid.
     - Save the assistant IDs into the configuration file for future use.
     """
 
-    # Step 6: Validate existing IDs
-    load_existing_ids()
-
-    # Step 7: Create assistants
-    zone_analyzer_id = create_assistant(
-        name=f"zone-analyzer_{int(time.time())}",
-        description=zone_analyzer_version,
-        instructions=zone_analyzer_instructions,
-    )
-    dns_helper_id = create_assistant(
-        name=f"dns-helper_{int(time.time())}",
-        description=dns_helper_version,
-        instructions=dns_helper_instructions,
-    )
-    zone_healthcheck_id = create_assistant(
-        name=f"zone-healthcheck_{int(time.time())}",
-        description=zone_healthcheck_version,
-        instructions=zone_healthcheck_instructions,
-    )
-    system_status_id = create_assistant(
-        name=f"system-status_{int(time.time())}",
-        description=system_status_version,
-        instructions=system_status_instructions,
-    )
-
-    # Step 8: Save to config.json
-    config = {
-        "zone_analyzer_id": zone_analyzer_id, 
-        "dns_helper_id": dns_helper_id, 
-        "zone_healthcheck_id": zone_healthcheck_id,
-        "system_status_id": system_status_id
+    # Step 5: Validate existing IDs
+    try:
+        data = _json.loads(Path(config_file).read_bytes())
+    except FileNotFoundError:
+        data = {}
+    except _json.JSONDecodeError:
+        data = None
+    if not isinstance(data, dict):
+        print("Invalid or corrupt config.json detected. Proceeding to recreate assistants.")
+        data = {}
+
+    existing = {
+        key: data[key] for key in REQUIRED_IDS
+        if isinstance(data.get(key), str) and ASSISTANT_ID_RE.match(data[key])
     }
-    os.makedirs(os.path.dirname(config_file), exist_ok=True)
-    with open(config_file, "w") as f:
-        json.dump(config, f, indent=4)
+    invalid = set(REQUIRED_IDS) - existing.keys()
+    if not invalid:
+        print("Valid assistant IDs already exist. Exiting initialization.")
+        return
+    if existing:
+        print(f"Invalid assistant IDs detected for {', '.join(sorted(invalid))}. Recreating only those assistants.")
+
+    # Step 6: Reuse or create assistants, tagging new ones with the same timestamp
+    ts = int(time.time())
+    cache = load_assistant_cache()
+    missing = [row for row in ASSISTANTS if row[0] in invalid]
+    ids = await asyncio.gather(*(
+        get_or_create_assistant(
+            cache,
+            name=f"{prefix}_{ts}",
+            description=version,
+            instructions=_load(prompt),
+        )
+        for _, prefix, version, prompt in missing
+    ), return_exceptions=True)
+
+    # Step 7: Save the assistant cache, even if an assistant failed, so the ones
+    # created in this run are reused next time, then save config.json
+    write_json(assistant_cache_file, cache)
+    for assistant_id in ids:
+        if isinstance(assistant_id, BaseException):
+            raise assistant_id
+    existing.update(zip((key for key, *_ in missing), ids))
+    write_json(config_file, {key: existing[key] for key in REQUIRED_IDS})
 
     print("Assistant IDs saved successfully.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
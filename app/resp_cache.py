@@ -0,0 +1,142 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from cachetools import TTLCache
+
+
+class ResponseCache:
+    """
+    A thread-safe cache for assistant responses, keyed by assistant name and prompt hash.
+
+    This cache lets the bot skip the OpenAI round-trip when an identical prompt has
+    already been answered by the same assistant. It provides:
+    - An in-memory TTL cache guarded by a re-entrant lock.
+    - Optional persistence to SQLite so cached responses survive restarts.
+
+    Each entry keeps the time its response was created, so a response loaded
+    from SQLite expires on its original schedule rather than a full TTL after
+    the restart.
+
+    Attributes:
+        ttl (int): Time-to-live of each cached response, in seconds.
+        db_file (str): Path to the SQLite file used for persistence.
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600, db_file="/data/response_cache.db"):
+        """
+        Initialize the ResponseCache and load any unexpired persisted entries.
+
+        Args:
+            maxsize (int, optional): Maximum number of cached responses. Defaults to 10000.
+            ttl (int, optional): Time-to-live in seconds. Defaults to 3600.
+            db_file (str, optional): Path to the SQLite file. Defaults to "/data/response_cache.db".
+                If the file cannot be opened, the cache runs in memory only.
+        """
+        self.ttl = ttl
+        self.db_file = db_file
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.RLock()
+        self._db = self._open_db()
+        self._load(maxsize)
+
+    @staticmethod
+    def make_key(assistant_name, prompt):
+        """
+        Build a cache key for a prompt sent to a specific assistant.
+
+        Args:
+            assistant_name (str): The name of the assistant (e.g., "zone_analyzer").
+            prompt (str): The full prompt sent to the assistant.
+
+        Returns:
+            tuple: The (assistant_name, SHA-256 hex digest of the prompt) key.
+        """
+        return (assistant_name, hashlib.sha256(prompt.encode()).hexdigest())
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Args:
+            key (tuple): A key built with `make_key`.
+
+        Returns:
+            str: The cached response, or None on a miss.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is None or time.time() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def set(self, key, response_text):
+        """
+        Store a response in the cache and persist it, pruning expired rows.
+
+        Args:
+            key (tuple): A key built with `make_key`.
+            response_text (str): The raw assistant response.
+        """
+        created = time.time()
+        with self._lock:
+            self._cache[key] = (created, response_text)
+            if self._db is None:
+                return
+            try:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (created - self.ttl,))
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (assistant, prompt_hash, response, created) VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], response_text, created),
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                pass  # Persistence is best-effort; the in-memory entry is still valid.
+
+    def _open_db(self):
+        """
+        Open the SQLite database and ensure the responses table exists.
+
+        Returns:
+            sqlite3.Connection: The open connection, or None if the database is unavailable.
+        """
+        try:
+            db = sqlite3.connect(self.db_file, check_same_thread=False)
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    assistant TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    PRIMARY KEY (assistant, prompt_hash)
+                )
+                """
+            )
+            db.commit()
+            return db
+        except sqlite3.Error:
+            return None
+
+    def _load(self, maxsize):
+        """
+        Drop expired rows from the database and load the rest into memory.
+
+        Args:
+            maxsize (int): Maximum number of rows to load.
+        """
+        if self._db is None:
+            return
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (cutoff,))
+                self._db.commit()
+                rows = self._db.execute(
+                    "SELECT assistant, prompt_hash, response, created FROM responses ORDER BY created DESC LIMIT ?",
+                    (maxsize,),
+                ).fetchall()
+            except sqlite3.Error:
+                return
+            for assistant, prompt_hash, response, created in reversed(rows):
+                self._cache[(assistant, prompt_hash)] = (created, response)